@@ -6,21 +6,66 @@ A lightweight script to quickly check the health of Wazuh components.
 """
 
 import os
+import queue
+import socket
 import sys
+import argparse
+import threading
 import requests
 import time
+import urllib3
 from urllib.parse import urlparse
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 # Load environment variables
 load_dotenv()
 
-def check_endpoint(url, name, timeout=10):
-    """Check if an endpoint is accessible."""
+# Shared session so probes reuse pooled keep-alive connections
+# (self-signed certificates are expected, so skip verification)
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+_SESSION = requests.Session()
+_SESSION.verify = False
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+
+# Seconds to wait for a TCP connection before treating an endpoint as down
+CONNECT_TIMEOUT = 2
+
+# Error reported for probes abandoned by --fail-fast
+SKIPPED = "Skipped after an earlier failure (--fail-fast)"
+
+def check_endpoint(url, name, timeout=10, stop_event=None):
+    """Check if an endpoint is accessible.
+    
+    If ``stop_event`` is set before the pre-check or the request is issued,
+    the check is abandoned and reported as skipped.
+    """
+    if stop_event is not None and stop_event.is_set():
+        return False, 0, 0, SKIPPED
+    
+    # Cheap TCP pre-check so dead endpoints fail fast instead of going
+    # through the full requests/urllib3 stack and its timeout
+    try:
+        parsed_url = urlparse(url)
+        port = parsed_url.port or (443 if parsed_url.scheme == "https" else 80)
+    except ValueError as e:
+        return False, 0, 0, f"Error: {str(e)}"
+    try:
+        with socket.create_connection((parsed_url.hostname, port), timeout=CONNECT_TIMEOUT):
+            pass
+    except OSError as e:
+        return False, 0, 0, f"Connection Error: {str(e)}"
+    
+    if stop_event is not None and stop_event.is_set():
+        return False, 0, 0, SKIPPED
+    
     try:
-        start_time = time.time()
-        response = requests.get(url, timeout=timeout, verify=False)
-        response_time = time.time() - start_time
+        # Only the status is needed, so don't download the body
+        start_time = time.perf_counter()
+        with _SESSION.get(url, timeout=timeout, stream=True) as response:
+            response_time = time.perf_counter() - start_time
         
         if response.status_code == 200:
             return True, response_time, response.status_code, None
@@ -36,10 +81,18 @@ def check_endpoint(url, name, timeout=10):
     except Exception as e:
         return False, 0, 0, f"Error: {str(e)}"
 
-def check_ui_accessibility(url, timeout=10):
+def check_ui_accessibility(url, timeout=10, stop_event=None):
     """Check if the UI is accessible."""
+    if stop_event is not None and stop_event.is_set():
+        return False, 0, SKIPPED
+    
     try:
-        response = requests.get(url, timeout=timeout, verify=False)
+        # Headers are enough to confirm the UI is served; skip the HTML body
+        response = _SESSION.head(url, timeout=timeout, allow_redirects=True)
+        if response.status_code in (405, 501):
+            # Server doesn't implement HEAD; fall back to a GET without reading the body
+            with _SESSION.get(url, timeout=timeout, stream=True) as response:
+                pass
         if response.status_code == 200:
             return True, response.status_code, None
         else:
@@ -49,8 +102,26 @@ def check_ui_accessibility(url, timeout=10):
 
 def main():
     """Main health check function."""
-    print("🔒 Wazuh SOC Health Check")
-    print("=" * 50)
+    parser = argparse.ArgumentParser(description="Wazuh SOC Health Check")
+    parser.add_argument("--fail-fast", action="store_true",
+                        help="Stop probing as soon as one component check fails")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Print live progress while the probes run")
+    args = parser.parse_args()
+    
+    # Buffer the report and write it in one go rather than print by print
+    lines = []
+    try:
+        return run_health_check(args, lines.append)
+    finally:
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
+
+def run_health_check(args, emit):
+    """Run all health checks, passing each report line to ``emit``."""
+    emit("🔒 Wazuh SOC Health Check")
+    emit("=" * 50)
     
     # Configuration
     config = {
@@ -58,11 +129,25 @@ def main():
         "manager_api_url": os.getenv("WAZUH_MANAGER_API_URL", "https://localhost:55000"),
         "indexer_url": os.getenv("WAZUH_INDEXER_URL", "https://localhost:9200"),
     }
+    parsed_urls = {key: urlparse(url) for key, url in config.items()}
     
     # Check if .env file exists
     if not os.path.exists(".env"):
-        print("⚠️  No .env file found. Using default localhost URLs.")
-        print("   Create .env file from env.example for production URLs.\n")
+        emit("⚠️  No .env file found. Using default localhost URLs.")
+        emit("   Create .env file from env.example for production URLs.\n")
+    
+    # Resolve each host once up front; this warms the resolver cache for the
+    # probes and reports DNS problems as configuration errors
+    for key, parsed_url in parsed_urls.items():
+        try:
+            port = parsed_url.port or (443 if parsed_url.scheme == "https" else 80)
+        except ValueError as e:
+            emit(f"❌ Configuration error: invalid port in {key}: {str(e)}")
+            continue
+        try:
+            socket.getaddrinfo(parsed_url.hostname, port, type=socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            emit(f"❌ Configuration error: cannot resolve host '{parsed_url.hostname}' ({key}): {str(e)}")
     
     # Health status tracking
     health_status = {
@@ -72,94 +157,132 @@ def main():
         "ssl_validation": False
     }
     
+    # Probe all endpoints concurrently; each check is an independent network wait
+    probes = [
+        ("dashboard_ui", check_ui_accessibility, (config["dashboard_url"],)),
+        ("manager_api", check_endpoint, (config["manager_api_url"], "Manager API")),
+        ("indexer_api", check_endpoint, (config["indexer_url"], "Indexer API")),
+    ]
+    stop_event = threading.Event()
+    results = {
+        "dashboard_ui": (False, 0, SKIPPED),
+        "manager_api": (False, 0, 0, SKIPPED),
+        "indexer_api": (False, 0, 0, SKIPPED),
+    }
+    finished = queue.Queue()
+    
+    def run_probe(component, check, probe_args):
+        try:
+            result = check(*probe_args, stop_event=stop_event)
+        except Exception as e:
+            result = e
+        finished.put((component, result))
+    
+    # Daemon threads, so a probe still in flight never holds up interpreter
+    # exit when the run is interrupted or abandoned
+    for component, check, probe_args in probes:
+        threading.Thread(target=run_probe, args=(component, check, probe_args), daemon=True).start()
+    
+    for _ in probes:
+        component, result = finished.get()
+        if isinstance(result, Exception):
+            raise result
+        results[component] = result
+        if args.verbose:
+            print(f"⏱️  {component} probe finished", flush=True)
+        if args.fail_fast and not result[0]:
+            # Abandon the remaining probes on the first failure
+            # (unfinished ones are daemon threads, so they don't delay exit)
+            stop_event.set()
+            break
+    
     # Test Dashboard UI
-    print("🔍 Checking Dashboard UI...")
-    accessible, status_code, error = check_ui_accessibility(config["dashboard_url"])
+    emit("🔍 Checking Dashboard UI...")
+    accessible, status_code, error = results["dashboard_ui"]
     if accessible:
-        print(f"✅ Dashboard UI: Accessible (HTTP {status_code})")
+        emit(f"✅ Dashboard UI: Accessible (HTTP {status_code})")
         health_status["dashboard_ui"] = True
     else:
-        print(f"❌ Dashboard UI: Not accessible - {error}")
+        emit(f"❌ Dashboard UI: Not accessible - {error}")
     
     # Test Manager API
-    print("\n🔍 Checking Manager API...")
-    accessible, response_time, status_code, error = check_endpoint(config["manager_api_url"], "Manager API")
+    emit("\n🔍 Checking Manager API...")
+    accessible, response_time, status_code, error = results["manager_api"]
     if accessible:
-        print(f"✅ Manager API: Healthy (HTTP {status_code}, {response_time:.2f}s)")
+        emit(f"✅ Manager API: Healthy (HTTP {status_code}, {response_time:.2f}s)")
         health_status["manager_api"] = True
     else:
-        print(f"❌ Manager API: Unhealthy - {error}")
+        emit(f"❌ Manager API: Unhealthy - {error}")
     
     # Test Indexer API
-    print("\n🔍 Checking Indexer API...")
-    accessible, response_time, status_code, error = check_endpoint(config["indexer_url"], "Indexer API")
+    emit("\n🔍 Checking Indexer API...")
+    accessible, response_time, status_code, error = results["indexer_api"]
     if accessible:
-        print(f"✅ Indexer API: Healthy (HTTP {status_code}, {response_time:.2f}s)")
+        emit(f"✅ Indexer API: Healthy (HTTP {status_code}, {response_time:.2f}s)")
         health_status["indexer_api"] = True
     else:
-        print(f"❌ Indexer API: Unhealthy - {error}")
+        emit(f"❌ Indexer API: Unhealthy - {error}")
     
     # Test SSL Configuration
-    print("\n🔍 Checking SSL Configuration...")
+    emit("\n🔍 Checking SSL Configuration...")
     ssl_issues = []
-    for name, url in [
-        ("Dashboard", config["dashboard_url"]),
-        ("Manager API", config["manager_api_url"]),
-        ("Indexer API", config["indexer_url"])
+    for name, key in [
+        ("Dashboard", "dashboard_url"),
+        ("Manager API", "manager_api_url"),
+        ("Indexer API", "indexer_url")
     ]:
-        parsed_url = urlparse(url)
-        if parsed_url.scheme == "https":
-            print(f"✅ {name}: HTTPS configured")
+        if parsed_urls[key].scheme == "https":
+            emit(f"✅ {name}: HTTPS configured")
         else:
-            print(f"❌ {name}: Not using HTTPS")
+            emit(f"❌ {name}: Not using HTTPS")
             ssl_issues.append(name)
     
     if not ssl_issues:
         health_status["ssl_validation"] = True
-        print("✅ All endpoints use HTTPS")
+        emit("✅ All endpoints use HTTPS")
     else:
-        print(f"⚠️  SSL issues found with: {', '.join(ssl_issues)}")
+        emit(f"⚠️  SSL issues found with: {', '.join(ssl_issues)}")
     
     # Calculate health score
     healthy_components = sum(health_status.values())
     total_components = len(health_status)
     health_score = (healthy_components / total_components) * 100
     
-    print("\n" + "=" * 50)
-    print(f"📊 System Health Score: {health_score:.1f}% ({healthy_components}/{total_components} components healthy)")
+    emit("\n" + "=" * 50)
+    emit(f"📊 System Health Score: {health_score:.1f}% ({healthy_components}/{total_components} components healthy)")
     
     # Health status summary
-    print("\n📋 Component Status:")
+    emit("\n📋 Component Status:")
     for component, status in health_status.items():
         status_icon = "✅" if status else "❌"
         status_text = "Healthy" if status else "Unhealthy"
-        print(f"  {status_icon} {component.replace('_', ' ').title()}: {status_text}")
+        emit(f"  {status_icon} {component.replace('_', ' ').title()}: {status_text}")
     
     # Recommendations
     if health_score < 100:
-        print("\n🔧 Recommendations:")
+        emit("\n🔧 Recommendations:")
         if not health_status["dashboard_ui"]:
-            print("  - Check dashboard service status and network connectivity")
-            print("  - Verify dashboard is running on the expected port")
+            emit("  - Check dashboard service status and network connectivity")
+            emit("  - Verify dashboard is running on the expected port")
         if not health_status["manager_api"]:
-            print("  - Verify manager service is running")
-            print("  - Check manager API configuration and firewall rules")
+            emit("  - Verify manager service is running")
+            emit("  - Check manager API configuration and firewall rules")
         if not health_status["indexer_api"]:
-            print("  - Check indexer service status")
-            print("  - Verify indexer cluster health")
+            emit("  - Check indexer service status")
+            emit("  - Verify indexer cluster health")
         if not health_status["ssl_validation"]:
-            print("  - Ensure all endpoints use HTTPS")
-            print("  - Check SSL certificate configuration")
+            emit("  - Ensure all endpoints use HTTPS")
+            emit("  - Check SSL certificate configuration")
     
     # Final status
     if health_score >= 75:
-        print(f"\n🎉 System is healthy! ({health_score:.1f}%)")
+        emit(f"\n🎉 System is healthy! ({health_score:.1f}%)")
         return 0
     elif health_score >= 50:
-        print(f"\n⚠️  System has issues but is operational ({health_score:.1f}%)")
+        emit(f"\n⚠️  System has issues but is operational ({health_score:.1f}%)")
         return 1
     else:
-        print(f"\n❌ System is unhealthy ({health_score:.1f}%)")
+        emit(f"\n❌ System is unhealthy ({health_score:.1f}%)")
         return 2
 
 if __name__ == "__main__":
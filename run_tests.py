@@ -11,6 +11,21 @@ import subprocess
 import argparse
 from pathlib import Path
 
+# Run test files in parallel worker processes (pytest-xdist); each file stays
+# on one worker so its session fixtures (browser, API session) are reused
+PARALLEL_ARGS = ["-n", "auto", "--dist=loadfile"]
+
+def output_args():
+    """Common pytest output options.
+    
+    Skips the .pytest_cache writes, and streams test stdout live instead of
+    capturing it when TEST_LIVE_OUTPUT=true (handy for local runs).
+    """
+    args = ["-p", "no:cacheprovider"]
+    if os.getenv("TEST_LIVE_OUTPUT", "false").lower() == "true":
+        args.append("--capture=no")
+    return args
+
 def run_command(cmd, description):
     """Run a command and handle errors."""
     print(f"\n🚀 {description}")
@@ -18,20 +33,13 @@ def run_command(cmd, description):
     print("-" * 60)
     
     try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        # Inherit stdio so output streams live instead of being buffered
+        sys.stdout.flush()
+        subprocess.run(cmd, check=True)
         print("✅ Command completed successfully")
-        if result.stdout:
-            print("Output:")
-            print(result.stdout)
         return True
     except subprocess.CalledProcessError as e:
         print(f"❌ Command failed with exit code {e.returncode}")
-        if e.stdout:
-            print("Stdout:")
-            print(e.stdout)
-        if e.stderr:
-            print("Stderr:")
-            print(e.stderr)
         return False
 
 def check_dependencies():
@@ -76,7 +84,7 @@ def run_ui_tests():
         "-v",
         "--tb=short",
         "--html=test-results/ui-report.html",
-        "--self-contained-html"
+        *output_args()
     ]
     return run_command(cmd, "Running UI Tests")
 
@@ -88,7 +96,7 @@ def run_api_tests():
         "-v",
         "--tb=short",
         "--html=test-results/api-report.html",
-        "--self-contained-html"
+        *output_args()
     ]
     return run_command(cmd, "Running API Tests")
 
@@ -100,7 +108,7 @@ def run_integration_tests():
         "-v",
         "--tb=short",
         "--html=test-results/integration-report.html",
-        "--self-contained-html"
+        *output_args()
     ]
     return run_command(cmd, "Running Integration Tests")
 
@@ -112,7 +120,8 @@ def run_all_tests():
         "-v",
         "--tb=short",
         "--html=test-results/full-report.html",
-        "--self-contained-html"
+        *output_args(),
+        *PARALLEL_ARGS
     ]
     return run_command(cmd, "Running All Tests")
 
@@ -125,7 +134,8 @@ def run_quick_tests():
         "--tb=short",
         "-m", "not optional and not slow",
         "--html=test-results/quick-report.html",
-        "--self-contained-html"
+        *output_args(),
+        *PARALLEL_ARGS
     ]
     return run_command(cmd, "Running Quick Tests (excluding optional and slow tests)")
 
@@ -153,6 +163,11 @@ Examples:
   python run_tests.py --quick                  # Run quick tests (skip optional/slow)
   python run_tests.py --health                 # Run health check only
   python run_tests.py --install-deps           # Install dependencies
+
+Environment:
+  CHROMEDRIVER_PATH    Use a pre-installed ChromeDriver instead of downloading
+                       one with webdriver-manager (e.g. for offline CI)
+  TEST_LIVE_OUTPUT     Set to "true" to stream test output live (--capture=no)
         """
     )
     
@@ -1,5 +1,6 @@
 import pytest
 import os
+import urllib3
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -9,6 +10,10 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Tests run against self-signed certificates with verification disabled;
+# silence the resulting warning once for the whole session
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
 @pytest.fixture(scope="session")
 def test_config():
     """Test configuration loaded from environment variables."""
@@ -27,17 +32,87 @@ def test_config():
         "implicit_wait": int(os.getenv("SELENIUM_IMPLICIT_WAIT", "10"))
     }
 
-@pytest.fixture(scope="function")
-def driver(test_config):
-    """Selenium WebDriver fixture with Chrome configuration."""
+@pytest.fixture(scope="session")
+def parsed_urls(test_config):
+    """Component URLs from the test configuration, parsed once per session."""
+    from urllib.parse import urlparse
+    
+    return {
+        key: urlparse(test_config[key])
+        for key in ("dashboard_url", "manager_api_url", "indexer_url")
+    }
+
+# Subresources the UI tests never assert on; blocked to cut page load time
+BLOCKED_RESOURCE_PATTERNS = ["*.png", "*.jpg", "*.gif", "*.svg", "*.ico", "*.woff", "*.woff2", "*.map"]
+
+# ChromeDriver path, resolved once per pytest process
+_chromedriver_path = None
+
+def _get_chromedriver_path():
+    """Install (or locate) ChromeDriver once and reuse the path.
+    
+    A pre-installed driver can be supplied with CHROMEDRIVER_PATH, which skips
+    webdriver-manager entirely (useful for offline CI).
+    """
+    global _chromedriver_path
+    if _chromedriver_path is None:
+        env_path = os.getenv("CHROMEDRIVER_PATH")
+        if env_path and os.access(env_path, os.X_OK):
+            _chromedriver_path = env_path
+        else:
+            _chromedriver_path = ChromeDriverManager().install()
+    return _chromedriver_path
+
+# Test modules that start a browser and so need ChromeDriver
+_BROWSER_TEST_MODULES = ("test_dashboard_ui.py", "test_integration.py")
+
+def _selects_browser_tests(config):
+    """Whether the paths being run can include tests that start a browser."""
+    for arg in config.args:
+        path = arg.split("::")[0]
+        if os.path.isdir(path) or os.path.basename(path) in _BROWSER_TEST_MODULES:
+            return True
+    return False
+
+def pytest_configure(config):
+    """Resolve ChromeDriver once in the xdist controller and share it with workers.
+    
+    Under ``pytest -n`` every worker process creates its own session-scoped
+    browser and API session; exporting CHROMEDRIVER_PATH before the workers
+    start stops them from racing to download the same driver. Runs limited
+    to API-only modules never need the driver and skip this.
+    """
+    is_controller = not hasattr(config, "workerinput")
+    if (
+        is_controller
+        and config.getoption("numprocesses", None)
+        and not os.getenv("CHROMEDRIVER_PATH")
+        and _selects_browser_tests(config)
+    ):
+        try:
+            os.environ["CHROMEDRIVER_PATH"] = ChromeDriverManager().install()
+        except Exception:
+            # Leave it to each worker (and surface the error in the UI tests)
+            pass
+
+@pytest.fixture(scope="session")
+def _browser(test_config):
+    """Chrome WebDriver shared by all tests in the session."""
     chrome_options = Options()
     
+    # Return from driver.get() at DOMContentLoaded rather than waiting for every
+    # script, stylesheet and image; tests use explicit waits for what they need
+    chrome_options.page_load_strategy = "eager"
+    
     if test_config["headless"]:
-        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--headless=new")
     
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_argument("--disable-remote-fonts")
     chrome_options.add_argument("--window-size=1920,1080")
     chrome_options.add_argument("--ignore-certificate-errors")
     chrome_options.add_argument("--ignore-ssl-errors")
@@ -47,16 +122,48 @@ def driver(test_config):
     chrome_options.add_argument("--ignore-certificate-errors-spki-list")
     chrome_options.add_argument("--ignore-ssl-errors")
     
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    service = Service(_get_chromedriver_path())
+    browser = webdriver.Chrome(service=service, options=chrome_options)
+    
+    # Tests only inspect the DOM, so skip fetching purely visual subresources
+    browser.execute_cdp_cmd("Network.enable", {})
+    browser.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_RESOURCE_PATTERNS})
     
     # Set implicit wait
-    driver.implicitly_wait(test_config["implicit_wait"])
+    browser.implicitly_wait(test_config["implicit_wait"])
     
-    yield driver
+    # Bound driver.get() itself; it raises TimeoutException like an explicit wait
+    browser.set_page_load_timeout(test_config["timeout"])
+    
+    yield browser
     
     # Cleanup
-    driver.quit()
+    browser.quit()
+
+@pytest.fixture(scope="class")
+def loaded_dashboard(_browser, test_config):
+    """Shared browser with the dashboard loaded once per test class.
+    
+    For read-only tests; tests that change page state should use ``driver``.
+    """
+    from selenium.common.exceptions import TimeoutException
+    
+    _browser.delete_all_cookies()
+    try:
+        # get() returns at DOMContentLoaded, by which point <body> is parsed
+        _browser.get(test_config["dashboard_url"])
+    except TimeoutException:
+        pytest.fail(f"Dashboard did not load within {test_config['timeout']} seconds")
+    
+    yield _browser
+
+@pytest.fixture(scope="function")
+def driver(_browser):
+    """Selenium WebDriver fixture with browser state reset between tests."""
+    _browser.delete_all_cookies()
+    _browser.execute_cdp_cmd("Network.clearBrowserCache", {})
+    
+    yield _browser
 
 @pytest.fixture(scope="session")
 def api_session(test_config):
@@ -67,19 +174,111 @@ def api_session(test_config):
     
     session = requests.Session()
     
-    # Configure retry strategy
+    # Configure retry strategy (single quick retry so one flaky endpoint
+    # doesn't dominate the suite's wall time)
     retry_strategy = Retry(
-        total=3,
-        backoff_factor=1,
+        total=1,
+        backoff_factor=0.2,
         status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=False,
     )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=retry_strategy)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     
     # For self-signed certificates in testing
     session.verify = False
-    import urllib3
-    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
     
-    return session 
\ No newline at end of file
+    # Pre-warm DNS and pooled connections for each component
+    for url in (test_config["manager_api_url"], test_config["indexer_url"], test_config["dashboard_url"]):
+        try:
+            session.head(url, timeout=5)
+        except requests.exceptions.RequestException:
+            pass
+    
+    return session 
+
+@pytest.fixture(scope="session")
+def api_session_noretry(test_config):
+    """Requests session without retries, for tests that measure response times.
+    
+    Retry backoff sleeps on the regular ``api_session`` would otherwise be
+    counted as endpoint latency.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    
+    # For self-signed certificates in testing
+    session.verify = False
+    
+    return session
+
+def _endpoint_urls(test_config):
+    """URLs fetched by endpoint_responses, keyed by endpoint name."""
+    return {
+        "manager": f"{test_config['manager_api_url']}/",
+        "manager_version": f"{test_config['manager_api_url']}/version",
+        "indexer": f"{test_config['indexer_url']}/",
+        "indexer_cluster_health": f"{test_config['indexer_url']}/_cluster/health",
+        "dashboard_status": f"{test_config['dashboard_url']}/api/status",
+    }
+
+@pytest.fixture(scope="session")
+def endpoint_responses(api_session, test_config):
+    """API responses fetched once per session and shared between tests.
+    
+    Maps an endpoint name to its response, or to the ``RequestException``
+    raised while fetching it. The endpoints are fetched concurrently.
+    """
+    import requests
+    from concurrent.futures import ThreadPoolExecutor
+    
+    def fetch(url):
+        try:
+            return api_session.get(url, timeout=30)
+        except requests.exceptions.RequestException as e:
+            return e
+    
+    endpoints = _endpoint_urls(test_config)
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+        return dict(zip(endpoints, executor.map(fetch, endpoints.values())))
+
+# endpoint_probes component -> the endpoint_responses entry it is built from
+_PROBE_SOURCES = {
+    "dashboard": "dashboard_status",
+    "manager_api": "manager",
+    "indexer_api": "indexer",
+}
+
+@pytest.fixture(scope="session")
+def endpoint_probes(endpoint_responses, test_config):
+    """Per-component summary of ``endpoint_responses`` for the integration tests.
+    
+    Maps ``dashboard``, ``manager_api`` and ``indexer_api`` to a dict with the
+    ``url``, ``status_code``, decoded ``json`` (or None) and the ``error``
+    raised, if any (None means the TLS connection succeeded). No further
+    requests are made; the dashboard is represented by its status endpoint.
+    """
+    import requests
+    
+    urls = _endpoint_urls(test_config)
+    probes = {}
+    for component, name in _PROBE_SOURCES.items():
+        result = endpoint_responses[name]
+        probe = {"url": urls[name], "status_code": None, "json": None, "error": None}
+        if isinstance(result, requests.exceptions.RequestException):
+            # Connection/SSL failures are recorded for the tests to report
+            probe["error"] = result
+        else:
+            probe["status_code"] = result.status_code
+            try:
+                probe["json"] = result.json()
+            except ValueError:
+                pass
+        probes[component] = probe
+    return probes
\ No newline at end of file
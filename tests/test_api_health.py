@@ -1,144 +1,146 @@
 import pytest
-import json
+import time
+import orjson
 import jsonschema
-from jsonschema import validate
+from jsonschema import Draft7Validator
 import requests
 
+# Basic schema for manager API response
+MANAGER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "api_version": {"type": "string"},
+        "revision": {"type": "string"}
+    },
+    "required": ["title"]
+}
+
+# Basic schema for OpenSearch response
+INDEXER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "cluster_name": {"type": "string"},
+        "version": {"type": "object"},
+        "tagline": {"type": "string"}
+    },
+    "required": ["name", "cluster_name", "version"]
+}
+
+# Cluster health schema
+CLUSTER_HEALTH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "cluster_name": {"type": "string"},
+        "status": {"type": "string", "enum": ["green", "yellow", "red"]},
+        "number_of_nodes": {"type": "integer"},
+        "active_primary_shards": {"type": "integer"},
+        "active_shards": {"type": "integer"}
+    },
+    "required": ["cluster_name", "status", "number_of_nodes"]
+}
+
+# Validators are built once and reused across tests
+_MANAGER_VALIDATOR = Draft7Validator(MANAGER_SCHEMA)
+_INDEXER_VALIDATOR = Draft7Validator(INDEXER_SCHEMA)
+_CLUSTER_HEALTH_VALIDATOR = Draft7Validator(CLUSTER_HEALTH_SCHEMA)
+
+def _cached_response(endpoint_responses, name, description):
+    """Return the cached response for an endpoint, failing the test if it was unreachable."""
+    result = endpoint_responses[name]
+    if isinstance(result, requests.exceptions.RequestException):
+        pytest.fail(f"Failed to connect to {description}: {str(result)}")
+    return result
+
 class TestWazuhAPIHealth:
     """Test suite for Wazuh API health endpoints."""
     
-    def test_manager_api_health(self, api_session, test_config):
+    def test_manager_api_health(self, endpoint_responses):
         """Test that the Wazuh manager API endpoint returns 200 and valid JSON."""
+        # Test basic connectivity to manager API
+        response = _cached_response(endpoint_responses, "manager", "manager API")
+        
+        # Check HTTP status
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        
+        # Check content type
+        content_type = response.headers.get('content-type', '')
+        assert 'application/json' in content_type, f"Expected JSON content type, got {content_type}"
+        
+        # Parse JSON response
         try:
-            # Test basic connectivity to manager API
-            response = api_session.get(
-                f"{test_config['manager_api_url']}/",
-                timeout=30
-            )
+            data = orjson.loads(response.content)
+            assert isinstance(data, dict), "Response should be a JSON object"
             
-            # Check HTTP status
-            assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+            # Validate against schema (allow extra fields)
+            _MANAGER_VALIDATOR.validate(data)
             
+            print(f"Manager API response: {orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()}")
+            
+        except orjson.JSONDecodeError:
+            pytest.fail("Response is not valid JSON")
+        except jsonschema.exceptions.ValidationError as e:
+            pytest.fail(f"Response does not match expected schema: {e}")
+    
+    def test_manager_api_version(self, endpoint_responses):
+        """Test that the manager API version endpoint is accessible."""
+        response = _cached_response(endpoint_responses, "manager_version", "manager API version endpoint")
+        
+        # Check HTTP status (200 or 404 is acceptable for version endpoint)
+        assert response.status_code in [200, 404], f"Unexpected status code: {response.status_code}"
+        
+        if response.status_code == 200:
             # Check content type
             content_type = response.headers.get('content-type', '')
             assert 'application/json' in content_type, f"Expected JSON content type, got {content_type}"
             
-            # Parse JSON response
-            try:
-                data = response.json()
-                assert isinstance(data, dict), "Response should be a JSON object"
-                
-                # Basic schema validation for manager API response
-                expected_schema = {
-                    "type": "object",
-                    "properties": {
-                        "title": {"type": "string"},
-                        "api_version": {"type": "string"},
-                        "revision": {"type": "string"}
-                    },
-                    "required": ["title"]
-                }
-                
-                # Validate against schema (allow extra fields)
-                validate(instance=data, schema=expected_schema)
-                
-                print(f"Manager API response: {json.dumps(data, indent=2)}")
-                
-            except json.JSONDecodeError:
-                pytest.fail("Response is not valid JSON")
-            except jsonschema.exceptions.ValidationError as e:
-                pytest.fail(f"Response does not match expected schema: {e}")
-                
-        except requests.exceptions.RequestException as e:
-            pytest.fail(f"Failed to connect to manager API: {str(e)}")
-    
-    def test_manager_api_version(self, api_session, test_config):
-        """Test that the manager API version endpoint is accessible."""
-        try:
-            response = api_session.get(
-                f"{test_config['manager_api_url']}/version",
-                timeout=30
-            )
-            
-            # Check HTTP status (200 or 404 is acceptable for version endpoint)
-            assert response.status_code in [200, 404], f"Unexpected status code: {response.status_code}"
-            
-            if response.status_code == 200:
-                # Check content type
-                content_type = response.headers.get('content-type', '')
-                assert 'application/json' in content_type, f"Expected JSON content type, got {content_type}"
-                
-                # Parse and validate version response
-                data = response.json()
-                assert isinstance(data, dict), "Version response should be a JSON object"
-                
-                # Version response typically contains version info
-                if 'api_version' in data:
-                    print(f"Manager API version: {data['api_version']}")
-                elif 'version' in data:
-                    print(f"Manager version: {data['version']}")
-                    
-        except requests.exceptions.RequestException as e:
-            pytest.fail(f"Failed to connect to manager API version endpoint: {str(e)}")
+            # Parse and validate version response
+            data = orjson.loads(response.content)
+            assert isinstance(data, dict), "Version response should be a JSON object"
+            
+            # Version response typically contains version info
+            if 'api_version' in data:
+                print(f"Manager API version: {data['api_version']}")
+            elif 'version' in data:
+                print(f"Manager version: {data['version']}")
     
-    def test_indexer_api_health(self, api_session, test_config):
+    def test_indexer_api_health(self, endpoint_responses):
         """Test that the Wazuh indexer (OpenSearch) API endpoint returns 200 and valid JSON."""
+        # Test basic connectivity to indexer API
+        response = _cached_response(endpoint_responses, "indexer", "indexer API")
+        
+        # Check HTTP status
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        
+        # Check content type
+        content_type = response.headers.get('content-type', '')
+        assert 'application/json' in content_type, f"Expected JSON content type, got {content_type}"
+        
+        # Parse JSON response
         try:
-            # Test basic connectivity to indexer API
-            response = api_session.get(
-                f"{test_config['indexer_url']}/",
-                timeout=30
-            )
+            data = orjson.loads(response.content)
+            assert isinstance(data, dict), "Response should be a JSON object"
             
-            # Check HTTP status
-            assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+            # Validate against schema (allow extra fields)
+            _INDEXER_VALIDATOR.validate(data)
             
-            # Check content type
-            content_type = response.headers.get('content-type', '')
-            assert 'application/json' in content_type, f"Expected JSON content type, got {content_type}"
+            print(f"Indexer API response: {orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()}")
             
-            # Parse JSON response
-            try:
-                data = response.json()
-                assert isinstance(data, dict), "Response should be a JSON object"
-                
-                # Basic schema validation for OpenSearch response
-                expected_schema = {
-                    "type": "object",
-                    "properties": {
-                        "name": {"type": "string"},
-                        "cluster_name": {"type": "string"},
-                        "version": {"type": "object"},
-                        "tagline": {"type": "string"}
-                    },
-                    "required": ["name", "cluster_name", "version"]
-                }
-                
-                # Validate against schema (allow extra fields)
-                validate(instance=data, schema=expected_schema)
-                
-                print(f"Indexer API response: {json.dumps(data, indent=2)}")
-                
-                # Check for OpenSearch/Wazuh indexer specific indicators
-                if 'tagline' in data:
-                    assert 'opensearch' in data['tagline'].lower() or 'elasticsearch' in data['tagline'].lower(), \
-                        "Should be OpenSearch or Elasticsearch"
-                
-            except json.JSONDecodeError:
-                pytest.fail("Response is not valid JSON")
-            except jsonschema.exceptions.ValidationError as e:
-                pytest.fail(f"Response does not match expected schema: {e}")
-                
-        except requests.exceptions.RequestException as e:
-            pytest.fail(f"Failed to connect to indexer API: {str(e)}")
+            # Check for OpenSearch/Wazuh indexer specific indicators
+            if 'tagline' in data:
+                assert 'opensearch' in data['tagline'].lower() or 'elasticsearch' in data['tagline'].lower(), \
+                    "Should be OpenSearch or Elasticsearch"
+            
+        except orjson.JSONDecodeError:
+            pytest.fail("Response is not valid JSON")
+        except jsonschema.exceptions.ValidationError as e:
+            pytest.fail(f"Response does not match expected schema: {e}")
     
-    def test_indexer_cluster_health(self, api_session, test_config):
+    def test_indexer_cluster_health(self, endpoint_responses):
         """Test that the indexer cluster health endpoint is accessible."""
         try:
-            response = api_session.get(
-                f"{test_config['indexer_url']}/_cluster/health",
-                timeout=30
-            )
+            response = _cached_response(endpoint_responses, "indexer_cluster_health", "indexer cluster health endpoint")
             
             # Check HTTP status
             assert response.status_code == 200, f"Expected 200, got {response.status_code}"
@@ -148,23 +150,11 @@ class TestWazuhAPIHealth:
             assert 'application/json' in content_type, f"Expected JSON content type, got {content_type}"
             
             # Parse and validate cluster health response
-            data = response.json()
+            data = orjson.loads(response.content)
             assert isinstance(data, dict), "Cluster health response should be a JSON object"
             
             # Cluster health schema validation
-            health_schema = {
-                "type": "object",
-                "properties": {
-                    "cluster_name": {"type": "string"},
-                    "status": {"type": "string", "enum": ["green", "yellow", "red"]},
-                    "number_of_nodes": {"type": "integer"},
-                    "active_primary_shards": {"type": "integer"},
-                    "active_shards": {"type": "integer"}
-                },
-                "required": ["cluster_name", "status", "number_of_nodes"]
-            }
-            
-            validate(instance=data, schema=health_schema)
+            _CLUSTER_HEALTH_VALIDATOR.validate(data)
             
             # Check cluster status
             status = data.get('status')
@@ -172,55 +162,40 @@ class TestWazuhAPIHealth:
             
             print(f"Cluster health: {data['status']} - {data['number_of_nodes']} nodes")
             
-        except requests.exceptions.RequestException as e:
-            pytest.fail(f"Failed to connect to indexer cluster health endpoint: {str(e)}")
         except jsonschema.exceptions.ValidationError as e:
             pytest.fail(f"Cluster health response does not match expected schema: {e}")
     
-    def test_dashboard_api_health(self, api_session, test_config):
+    def test_dashboard_api_health(self, endpoint_responses):
         """Test that the Wazuh dashboard API endpoint is accessible."""
-        try:
-            # Test basic connectivity to dashboard API
-            response = api_session.get(
-                f"{test_config['dashboard_url']}/api/status",
-                timeout=30
-            )
-            
-            # Dashboard API might return different status codes depending on authentication
-            # 200 = authenticated, 401 = unauthenticated, 403 = forbidden
-            assert response.status_code in [200, 401, 403], f"Unexpected status code: {response.status_code}"
-            
-            if response.status_code == 200:
-                # Check content type
-                content_type = response.headers.get('content-type', '')
-                assert 'application/json' in content_type, f"Expected JSON content type, got {content_type}"
-                
-                # Parse and validate response
-                data = response.json()
-                assert isinstance(data, dict), "Dashboard API response should be a JSON object"
-                
-                print(f"Dashboard API response: {json.dumps(data, indent=2)}")
-            else:
-                print(f"Dashboard API requires authentication (status: {response.status_code})")
-                
-        except requests.exceptions.RequestException as e:
-            pytest.fail(f"Failed to connect to dashboard API: {str(e)}")
+        # Test basic connectivity to dashboard API
+        response = _cached_response(endpoint_responses, "dashboard_status", "dashboard API")
+        
+        # Dashboard API might return different status codes depending on authentication
+        # 200 = authenticated, 401 = unauthenticated, 403 = forbidden
+        assert response.status_code in [200, 401, 403], f"Unexpected status code: {response.status_code}"
+        
+        if response.status_code == 200:
+            # Check content type
+            content_type = response.headers.get('content-type', '')
+            assert 'application/json' in content_type, f"Expected JSON content type, got {content_type}"
+            
+            # Parse and validate response
+            data = orjson.loads(response.content)
+            assert isinstance(data, dict), "Dashboard API response should be a JSON object"
+            
+            print(f"Dashboard API response: {orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()}")
+        else:
+            print(f"Dashboard API requires authentication (status: {response.status_code})")
     
-    def test_api_ssl_validation(self, api_session, test_config):
+    def test_api_ssl_validation(self, parsed_urls):
         """Test that all API endpoints use HTTPS."""
-        endpoints = [
-            test_config['manager_api_url'],
-            test_config['indexer_url'],
-            test_config['dashboard_url']
-        ]
-        
-        for endpoint in endpoints:
-            parsed_url = requests.utils.urlparse(endpoint)
-            assert parsed_url.scheme == 'https', f"Endpoint {endpoint} should use HTTPS, got {parsed_url.scheme}"
+        for key in ("manager_api_url", "indexer_url", "dashboard_url"):
+            parsed_url = parsed_urls[key]
+            assert parsed_url.scheme == 'https', f"Endpoint {parsed_url.geturl()} should use HTTPS, got {parsed_url.scheme}"
         
         print("All API endpoints are configured to use HTTPS")
     
-    def test_api_response_times(self, api_session, test_config):
+    def test_api_response_times(self, api_session_noretry, test_config):
         """Test that API endpoints respond within acceptable time limits."""
         endpoints = [
             (f"{test_config['manager_api_url']}/", "Manager API"),
@@ -232,9 +207,10 @@ class TestWazuhAPIHealth:
         
         for endpoint, name in endpoints:
             try:
-                start_time = requests.utils.time.time()
-                response = api_session.get(endpoint, timeout=30)
-                response_time = requests.utils.time.time() - start_time
+                # Time to first byte on a single attempt; the body is never downloaded
+                start_time = time.perf_counter()
+                with api_session_noretry.get(endpoint, timeout=30, stream=True):
+                    response_time = time.perf_counter() - start_time
                 
                 assert response_time < max_response_time, \
                     f"{name} response time {response_time:.2f}s exceeds {max_response_time}s limit"
@@ -242,4 +218,4 @@ class TestWazuhAPIHealth:
                 print(f"{name} response time: {response_time:.2f}s")
                 
             except requests.exceptions.RequestException as e:
-                pytest.fail(f"Failed to test {name} response time: {str(e)}") 
\ No newline at end of file
+                pytest.fail(f"Failed to test {name} response time: {str(e)}")
\ No newline at end of file
@@ -1,25 +1,57 @@
 import pytest
-import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from urllib.parse import urlparse
 
+# Common login form elements: username field, password field, submit button, form
+_LOGIN_SELECTORS = ("input[type='text']", "input[type='password']", "button[type='submit']", "form")
+
+# Element classes and page text that indicate a logged-in dashboard
+_DASHBOARD_CLASSES = ("dashboard", "main", "content")
+_DASHBOARD_TEXTS = ("Overview", "Security", "Management")
+
+# Page text that indicates a failed login
+_ERROR_INDICATORS = ("error", "invalid", "failed", "unauthorized")
+
+# Returns, for each CSS selector in arguments[0], whether a matching element is displayed
+_DISPLAYED_SELECTORS_JS = """
+return arguments[0].map(function (selector) {
+    var element = document.querySelector(selector);
+    return element !== null && element.offsetParent !== null;
+});
+"""
+
+# Returns the first dashboard indicator found: an element whose class contains
+# one of arguments[0], or page text containing one of arguments[1]; else null
+_DASHBOARD_INDICATOR_JS = """
+var classes = arguments[0], texts = arguments[1];
+for (var i = 0; i < classes.length; i++) {
+    if (document.querySelector('[class*="' + classes[i] + '"]')) {
+        return 'class: ' + classes[i];
+    }
+}
+var bodyText = document.body.innerText;
+for (var j = 0; j < texts.length; j++) {
+    if (bodyText.includes(texts[j])) {
+        return 'text: ' + texts[j];
+    }
+}
+return null;
+"""
+
+def wait(driver, timeout=10):
+    """WebDriverWait that polls every 100 ms instead of the default 500 ms."""
+    return WebDriverWait(driver, timeout, poll_frequency=0.1)
+
 class TestWazuhDashboardUI:
     """Test suite for Wazuh Dashboard UI functionality."""
     
-    def test_dashboard_https_accessible(self, driver, test_config):
+    def test_dashboard_https_accessible(self, loaded_dashboard):
         """Test that the Wazuh dashboard is reachable over HTTPS."""
+        driver = loaded_dashboard
         try:
-            # Navigate to dashboard
-            driver.get(test_config["dashboard_url"])
-            
-            # Wait for page to load
-            WebDriverWait(driver, test_config["timeout"]).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
             # Verify HTTPS protocol
             current_url = driver.current_url
             parsed_url = urlparse(current_url)
@@ -28,20 +60,16 @@ class TestWazuhDashboardUI:
             # Verify we can reach the page (no connection errors)
             assert "error" not in driver.title.lower(), f"Page title contains error: {driver.title}"
             
-        except TimeoutException:
-            pytest.fail(f"Dashboard did not load within {test_config['timeout']} seconds")
         except WebDriverException as e:
             pytest.fail(f"Failed to access dashboard: {str(e)}")
     
-    def test_dashboard_page_title(self, driver, test_config):
+    def test_dashboard_page_title(self, loaded_dashboard, test_config):
         """Test that the dashboard page title is correct."""
+        driver = loaded_dashboard
+        timeout = test_config["timeout"]
         try:
-            driver.get(test_config["dashboard_url"])
-            
-            # Wait for page to load
-            WebDriverWait(driver, test_config["timeout"]).until(
-                EC.presence_of_element_located((By.TAG_NAME, "title"))
-            )
+            # Wait for a non-empty title (a cheap getTitle call, not an element lookup)
+            wait(driver, timeout).until(lambda d: bool(d.title))
             
             # Check page title
             page_title = driver.title
@@ -52,138 +80,119 @@ class TestWazuhDashboardUI:
             print(f"Dashboard page title: {page_title}")
             
         except TimeoutException:
-            pytest.fail(f"Dashboard did not load within {test_config['timeout']} seconds")
+            pytest.fail(f"Dashboard page title was still empty after {timeout} seconds")
     
-    def test_login_form_elements_present(self, driver, test_config):
+    def test_login_form_elements_present(self, loaded_dashboard):
         """Test that login form elements are present on the dashboard."""
+        driver = loaded_dashboard
+        
+        # Wait for login form to appear, checking every selector in a single browser round-trip per poll
         try:
-            driver.get(test_config["dashboard_url"])
-            
-            # Wait for login form to appear
-            # Look for common login form elements
-            login_form_selectors = [
-                "input[type='text']",  # Username field
-                "input[type='password']",  # Password field
-                "button[type='submit']",  # Submit button
-                "form",  # Form element
-            ]
-            
-            for selector in login_form_selectors:
-                try:
-                    element = WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    assert element.is_displayed(), f"Element {selector} is not displayed"
-                except TimeoutException:
-                    pytest.fail(f"Login form element {selector} not found within 10 seconds")
-            
-            # Additional check for Wazuh-specific elements
-            try:
-                # Look for Wazuh branding or specific login elements
-                wazuh_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'Wazuh')]")
-                if wazuh_elements:
-                    print(f"Found {len(wazuh_elements)} Wazuh-related elements")
-                
-            except Exception as e:
-                print(f"Note: Could not verify Wazuh-specific elements: {e}")
-                
+            wait(driver, 10).until(
+                lambda d: all(d.execute_script(_DISPLAYED_SELECTORS_JS, _LOGIN_SELECTORS))
+            )
         except TimeoutException:
-            pytest.fail(f"Dashboard did not load within {test_config['timeout']} seconds")
+            displayed = driver.execute_script(_DISPLAYED_SELECTORS_JS, _LOGIN_SELECTORS)
+            missing = [selector for selector, shown in zip(_LOGIN_SELECTORS, displayed) if not shown]
+            pytest.fail(f"Login form elements {missing} not displayed within 10 seconds")
+        
+        # Additional check for Wazuh-specific elements
+        try:
+            # Look for Wazuh branding in the page text (a single scan in the
+            # browser; returns a count rather than element handles)
+            wazuh_mentions = driver.execute_script(
+                "return (document.body.innerText.match(/Wazuh/g) || []).length"
+            )
+            if wazuh_mentions:
+                print(f"Found {wazuh_mentions} Wazuh mentions on the page")
+            
+        except Exception as e:
+            print(f"Note: Could not verify Wazuh-specific elements: {e}")
     
+    def test_dashboard_responsiveness(self, loaded_dashboard):
+        """Test that the dashboard responds to basic interactions."""
+        driver = loaded_dashboard
+        try:
+            # Test basic page interactions
+            body = driver.find_element(By.TAG_NAME, "body")
+            
+            # Check if page is interactive
+            assert body.is_enabled(), "Page body should be enabled"
+            
+            # Test page source length (should have content); measured in the
+            # browser so the markup isn't shipped over the WebDriver protocol
+            page_length = driver.execute_script("return document.documentElement.outerHTML.length")
+            assert page_length > 1000, "Page should have substantial content"
+            
+        except Exception as e:
+            pytest.fail(f"Dashboard responsiveness test failed: {str(e)}")
+    
+    # Console logging isn't enabled globally on the driver; the log is only
+    # read here, and quick runs skip it
+    @pytest.mark.optional
+    def test_browser_console_logs(self, loaded_dashboard):
+        """Report JavaScript console output from the dashboard (basic check)."""
+        try:
+            logs = loaded_dashboard.get_log("browser")
+            if logs:
+                print(f"Browser console logs: {logs}")
+        except WebDriverException as e:
+            pytest.skip(f"Browser console logs are not available: {str(e)}")
+    
+    # Submits the login form, so it runs last to leave the shared page intact
     @pytest.mark.optional
     def test_programmatic_login(self, driver, test_config):
         """Test programmatic login using test account credentials."""
+        url, timeout = test_config["dashboard_url"], test_config["timeout"]
+        username, password = test_config["dashboard_username"], test_config["dashboard_password"]
+        
         # Skip if credentials are not provided
-        if not test_config["dashboard_username"] or not test_config["dashboard_password"]:
+        if not username or not password:
             pytest.skip("Dashboard credentials not provided in environment variables")
         
         try:
-            driver.get(test_config["dashboard_url"])
-            
-            # Wait for login form
-            username_field = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='text']"))
+            driver.get(url)
+            
+            # Wait for all login form fields in a single poll loop
+            username_field, password_field, submit_button = wait(driver, 10).until(
+                EC.all_of(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='text']")),
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='password']")),
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "button[type='submit']"))
+                )
             )
-            password_field = driver.find_element(By.CSS_SELECTOR, "input[type='password']")
-            submit_button = driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
             
             # Clear fields and enter credentials
             username_field.clear()
-            username_field.send_keys(test_config["dashboard_username"])
+            username_field.send_keys(username)
             
             password_field.clear()
-            password_field.send_keys(test_config["dashboard_password"])
+            password_field.send_keys(password)
             
             # Submit login form
             submit_button.click()
             
-            # Wait for login to complete and redirect
-            time.sleep(3)  # Allow time for login processing
+            # Wait for login to complete by leaving the login page
+            try:
+                wait(driver, timeout).until(lambda d: "login" not in d.current_url.lower())
+            except TimeoutException:
+                pytest.fail("Still on login page after login attempt")
             
-            # Check if we're redirected to dashboard (not login page)
-            current_url = driver.current_url
-            assert "login" not in current_url.lower(), "Still on login page after login attempt"
-            
-            # Look for dashboard elements that indicate successful login
-            dashboard_indicators = [
-                "//*[contains(@class, 'dashboard')]",
-                "//*[contains(@class, 'main')]",
-                "//*[contains(@class, 'content')]",
-                "//*[contains(text(), 'Overview')]",
-                "//*[contains(text(), 'Security')]",
-                "//*[contains(text(), 'Management')]"
-            ]
-            
-            dashboard_found = False
-            for indicator in dashboard_indicators:
-                try:
-                    elements = driver.find_elements(By.XPATH, indicator)
-                    if elements:
-                        dashboard_found = True
-                        print(f"Found dashboard indicator: {indicator}")
-                        break
-                except:
-                    continue
+            # Look for dashboard elements that indicate successful login,
+            # checked in one browser call instead of an XPath walk per indicator
+            indicator = driver.execute_script(_DASHBOARD_INDICATOR_JS, _DASHBOARD_CLASSES, _DASHBOARD_TEXTS)
+            dashboard_found = indicator is not None
+            if dashboard_found:
+                print(f"Found dashboard indicator: {indicator}")
             
             assert dashboard_found, "Could not find dashboard elements after login"
             
             # Verify we're not on an error page
-            error_indicators = ["error", "invalid", "failed", "unauthorized"]
             page_text = driver.page_source.lower()
-            for error in error_indicators:
+            for error in _ERROR_INDICATORS:
                 assert error not in page_text, f"Login error detected: {error}"
                 
         except TimeoutException:
             pytest.fail(f"Login form elements not found within timeout period")
         except Exception as e:
-            pytest.fail(f"Login test failed: {str(e)}")
-    
-    def test_dashboard_responsiveness(self, driver, test_config):
-        """Test that the dashboard responds to basic interactions."""
-        try:
-            driver.get(test_config["dashboard_url"])
-            
-            # Wait for page to load
-            WebDriverWait(driver, test_config["timeout"]).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # Test basic page interactions
-            body = driver.find_element(By.TAG_NAME, "body")
-            
-            # Check if page is interactive
-            assert body.is_enabled(), "Page body should be enabled"
-            
-            # Test page source length (should have content)
-            page_source = driver.page_source
-            assert len(page_source) > 1000, "Page should have substantial content"
-            
-            # Check for JavaScript errors in console (basic check)
-            logs = driver.get_log("browser")
-            if logs:
-                print(f"Browser console logs: {logs}")
-            
-        except TimeoutException:
-            pytest.fail(f"Dashboard did not load within {test_config['timeout']} seconds")
-        except Exception as e:
-            pytest.fail(f"Dashboard responsiveness test failed: {str(e)}") 
\ No newline at end of file
+            pytest.fail(f"Login test failed: {str(e)}")
\ No newline at end of file
@@ -1,34 +1,62 @@
 import pytest
 import time
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
+# Page text that may indicate dashboard-to-manager connectivity problems
+_CONNECTION_ERROR_PATTERN = "connection refused|timeout|unreachable|manager|api"
+
+# Health components checked from endpoint_probes: component -> (probe, label)
+_PROBED_COMPONENTS = {
+    "manager_api": ("manager_api", "Manager API"),
+    "indexer_api": ("indexer_api", "Indexer API"),
+    "ssl_connections": ("dashboard", "SSL Connections"),
+}
+
+# API statuses that show a component is up (401/403: reachable, needs auth)
+_REACHABLE_STATUSES = (200, 401, 403)
+
+def _probed_component_health(endpoint_probes, component, strict=True):
+    """Return ``(healthy, summary line)`` for a component in _PROBED_COMPONENTS.
+    
+    With ``strict`` an API must return 200; otherwise any status in
+    _REACHABLE_STATUSES counts as healthy.
+    """
+    probe_name, label = _PROBED_COMPONENTS[component]
+    probe = endpoint_probes[probe_name]
+    if component == "ssl_connections":
+        # Any completed request proves the TLS connection works
+        if probe["error"] is None:
+            return True, f"✓ {label}: Healthy"
+        return False, f"✗ {label}: Issues detected"
+    if probe["error"] is not None:
+        return False, f"✗ {label}: Unhealthy"
+    if probe["status_code"] == 200 or (not strict and probe["status_code"] in _REACHABLE_STATUSES):
+        return True, f"✓ {label}: Healthy"
+    return False, f"⚠ {label}: Status {probe['status_code']}"
+
 class TestWazuhIntegration:
     """Integration tests that validate the overall Wazuh system health."""
     
-    def test_system_connectivity(self, driver, api_session, test_config):
+    def test_system_connectivity(self, driver, endpoint_probes, test_config):
         """Test that all Wazuh components are accessible and communicating."""
         components = [
-            ("Dashboard", test_config["dashboard_url"]),
-            ("Manager API", test_config["manager_api_url"]),
-            ("Indexer API", test_config["indexer_url"])
+            ("Dashboard", "dashboard"),
+            ("Manager API", "manager_api"),
+            ("Indexer API", "indexer_api")
         ]
         
-        for name, url in components:
+        for name, key in components:
             try:
                 if name == "Dashboard":
                     # Test UI accessibility
-                    driver.get(url)
-                    WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.TAG_NAME, "body"))
-                    )
+                    driver.get(test_config["dashboard_url"])
                     print(f"✓ {name} UI is accessible")
                 else:
-                    # Test API accessibility
-                    response = api_session.get(url, timeout=10)
-                    assert response.status_code in [200, 401, 403], f"{name} returned status {response.status_code}"
+                    # Test API accessibility (reusing the shared session probe)
+                    probe = endpoint_probes[key]
+                    if probe["error"] is not None:
+                        raise probe["error"]
+                    assert probe["status_code"] in _REACHABLE_STATUSES, f"{name} returned status {probe['status_code']}"
                     print(f"✓ {name} API is accessible")
                     
             except Exception as e:
@@ -36,41 +64,31 @@ class TestWazuhIntegration:
     
     def test_dashboard_to_manager_communication(self, driver, test_config):
         """Test that the dashboard can communicate with the manager."""
+        url = test_config["dashboard_url"]
         try:
-            # Navigate to dashboard
-            driver.get(test_config["dashboard_url"])
+            # Navigate to dashboard; get() returns once the DOM is parsed
+            driver.get(url)
             
-            # Wait for page to load
-            WebDriverWait(driver, test_config["timeout"]).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            # Check for any error messages related to manager connectivity.
+            # The page text is scanned in the browser with a single regex pass
+            # and only the matching lines (for context) are returned
+            connection_errors = driver.execute_script(
+                """
+                var pattern = new RegExp(arguments[0]);
+                return document.body.innerText.toLowerCase().split('\\n')
+                    .filter(function (line) { return pattern.test(line); })
+                    .map(function (line) { return line.trim(); });
+                """,
+                _CONNECTION_ERROR_PATTERN
             )
             
-            # Check for any error messages related to manager connectivity
-            error_indicators = [
-                "connection refused",
-                "timeout",
-                "unreachable",
-                "manager",
-                "api"
-            ]
-            
-            page_text = driver.page_source.lower()
-            connection_errors = []
-            
-            for indicator in error_indicators:
-                if indicator in page_text:
-                    # Look for context around the error
-                    lines = page_text.split('\n')
-                    for line in lines:
-                        if indicator in line:
-                            connection_errors.append(line.strip())
-            
             if connection_errors:
                 print(f"Potential connection issues found: {connection_errors[:3]}")  # Show first 3
                 # Don't fail the test immediately, just log the issues
             
             # Check if page loaded successfully (basic validation)
-            assert len(driver.page_source) > 1000, "Dashboard should have substantial content"
+            page_length = driver.execute_script("return document.documentElement.outerHTML.length")
+            assert page_length > 1000, "Dashboard should have substantial content"
             print("✓ Dashboard loaded successfully")
             
         except TimeoutException:
@@ -78,27 +96,26 @@ class TestWazuhIntegration:
         except Exception as e:
             pytest.fail(f"Dashboard connectivity test failed: {str(e)}")
     
-    def test_api_endpoint_consistency(self, api_session, test_config):
+    def test_api_endpoint_consistency(self, endpoint_probes):
         """Test that all API endpoints return consistent response formats."""
         endpoints = [
-            (f"{test_config['manager_api_url']}/", "Manager API"),
-            (f"{test_config['indexer_url']}/", "Indexer API")
+            ("manager_api", "Manager API"),
+            ("indexer_api", "Indexer API")
         ]
         
         responses = {}
         
         for endpoint, name in endpoints:
-            try:
-                response = api_session.get(endpoint, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    responses[name] = data
-                    print(f"✓ {name} returned valid JSON")
-                else:
-                    print(f"⚠ {name} returned status {response.status_code}")
-                    
-            except Exception as e:
-                print(f"✗ {name} test failed: {str(e)}")
+            probe = endpoint_probes[endpoint]
+            if probe["error"] is not None:
+                print(f"✗ {name} test failed: {str(probe['error'])}")
+            elif probe["status_code"] != 200:
+                print(f"⚠ {name} returned status {probe['status_code']}")
+            elif probe["json"] is None:
+                print(f"✗ {name} test failed: response is not valid JSON")
+            else:
+                responses[name] = probe["json"]
+                print(f"✓ {name} returned valid JSON")
         
         # Validate that we got at least some successful responses
         assert len(responses) > 0, "No API endpoints returned successful responses"
@@ -108,28 +125,26 @@ class TestWazuhIntegration:
             assert isinstance(data, dict), f"{name} response should be a dictionary"
             assert len(data) > 0, f"{name} response should not be empty"
     
-    def test_ssl_certificate_validation(self, api_session, test_config):
+    def test_ssl_certificate_validation(self, endpoint_probes):
         """Test that all endpoints use proper SSL certificates."""
-        endpoints = [
-            test_config["dashboard_url"],
-            test_config["manager_api_url"],
-            test_config["indexer_url"]
-        ]
-        
-        for endpoint in endpoints:
-            try:
-                # Make a request to check SSL
-                response = api_session.get(endpoint, timeout=10)
-                
-                # If we get here, SSL connection was successful
-                print(f"✓ SSL connection successful to {endpoint}")
-                
-            except Exception as e:
+        for endpoint in ("dashboard", "manager_api", "indexer_api"):
+            probe = endpoint_probes[endpoint]
+            if probe["error"] is None:
+                # The request completed, so the SSL connection was successful
+                print(f"✓ SSL connection successful to {probe['url']}")
+            else:
                 # SSL errors would typically cause connection failures
-                print(f"⚠ SSL connection issue with {endpoint}: {str(e)}")
+                print(f"⚠ SSL connection issue with {probe['url']}: {str(probe['error'])}")
                 # Don't fail the test for SSL issues in testing environment
     
-    def test_system_health_summary(self, driver, api_session, test_config):
+    @pytest.mark.parametrize("component", list(_PROBED_COMPONENTS))
+    def test_component_health(self, endpoint_probes, component):
+        """Check that a single component is reachable, from the shared endpoint probes."""
+        healthy, summary = _probed_component_health(endpoint_probes, component, strict=False)
+        print(summary)
+        assert healthy, summary
+    
+    def test_system_health_summary(self, driver, endpoint_probes, test_config):
         """Provide a comprehensive summary of system health."""
         health_status = {
             "dashboard_ui": False,
@@ -141,43 +156,15 @@ class TestWazuhIntegration:
         try:
             # Test Dashboard UI
             driver.get(test_config["dashboard_url"])
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
             health_status["dashboard_ui"] = True
             print("✓ Dashboard UI: Healthy")
         except:
             print("✗ Dashboard UI: Unhealthy")
         
-        try:
-            # Test Manager API
-            response = api_session.get(f"{test_config['manager_api_url']}/", timeout=10)
-            if response.status_code == 200:
-                health_status["manager_api"] = True
-                print("✓ Manager API: Healthy")
-            else:
-                print(f"⚠ Manager API: Status {response.status_code}")
-        except:
-            print("✗ Manager API: Unhealthy")
-        
-        try:
-            # Test Indexer API
-            response = api_session.get(f"{test_config['indexer_url']}/", timeout=10)
-            if response.status_code == 200:
-                health_status["indexer_api"] = True
-                print("✓ Indexer API: Healthy")
-            else:
-                print(f"⚠ Indexer API: Status {response.status_code}")
-        except:
-            print("✗ Indexer API: Unhealthy")
-        
-        try:
-            # Test SSL connections
-            api_session.get(test_config["dashboard_url"], timeout=5)
-            health_status["ssl_connections"] = True
-            print("✓ SSL Connections: Healthy")
-        except:
-            print("✗ SSL Connections: Issues detected")
+        # API and SSL components come from the shared endpoint probes
+        for component in _PROBED_COMPONENTS:
+            health_status[component], summary = _probed_component_health(endpoint_probes, component)
+            print(summary)
         
         # Calculate overall health score
         healthy_components = sum(health_status.values())